@@ -2,8 +2,15 @@ import multiprocessing
 
 # Gunicorn configuration for Render deployment
 bind = "0.0.0.0:10000"  # Render will override this with PORT env variable
-workers = multiprocessing.cpu_count() * 2 + 1
-threads = 2
+# Hand strength calculations are CPU-bound, so run one process per core and
+# let a few threads per worker overlap request I/O
+workers = multiprocessing.cpu_count()
+threads = 4
 timeout = 60
-worker_class = "sync"
+worker_class = "gthread"
 loglevel = "info"
+# Load the app (and build its evaluation tables) once in the master, then fork
+preload_app = True
+
+# Each worker already has a core to itself, so run simulations in-process
+raw_env = ["POKER_ENGINE_PROCESSES=1"]
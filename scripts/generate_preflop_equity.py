@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Preflop Equity Table Generator
+This script estimates the preflop equity of all 169 starting hands against 1 to 8
+random opponents with a large Monte Carlo run, and writes the results to
+data/preflop_equity.json for the poker engine to load at startup.
+"""
+import os
+import sys
+import json
+import argparse
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.poker_engine import PokerEngine, RANKS, SUITS, warm_up
+
+OUTPUT_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data',
+                                           'preflop_equity.json'))
+BATCH_SIZE = 10000
+
+def starting_hands(engine):
+    """Yield one representative pair of hole cards for each of the 169 starting hands."""
+    ranks = RANKS[::-1]
+    for i, high_rank in enumerate(ranks):
+        for low_rank in ranks[i:]:
+            high_card = engine.parse_card(high_rank + SUITS[0])
+            if high_rank != low_rank:
+                yield [high_card, engine.parse_card(low_rank + SUITS[0])]
+            yield [high_card, engine.parse_card(low_rank + SUITS[1])]
+
+def estimate_equity(hole_cards, num_players, num_simulations):
+    """Estimate the share of deals in which no opponent beats the given hole cards."""
+    hole = tuple(card.index for card in hole_cards)
+    available_mask = (1 << 52) - 1
+    for card in hole_cards:
+        available_mask &= ~card.bit
+    wins = 0
+    for start in range(0, num_simulations, BATCH_SIZE):
+        batch = min(BATCH_SIZE, num_simulations - start)
+        wins += PokerEngine._run_simulation_batch(hole, (), available_mask, num_players, batch)
+    return wins / num_simulations
+
+def main():
+    """Generate the preflop equity table."""
+    parser = argparse.ArgumentParser(description='Generate the preflop equity table.')
+    parser.add_argument('--simulations', type=int, default=200000,
+                        help='Simulations per starting hand and player count')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Output JSON file')
+    args = parser.parse_args()
+    
+    warm_up()
+    engine = PokerEngine()
+    table = {}
+    for hole_cards in starting_hands(engine):
+        key = engine.get_starting_hand_key(hole_cards)
+        table[key] = {str(num_players): round(estimate_equity(hole_cards, num_players,
+                                                              args.simulations), 4)
+                      for num_players in range(2, 10)}
+        print(f"{key}: {table[key]}")
+    
+    with open(args.output, 'w') as f:
+        json.dump(table, f, indent=2)
+    print(f"Wrote {len(table)} starting hands to {args.output}")
+
+if __name__ == '__main__':
+    main()
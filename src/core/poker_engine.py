@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Poker Tournament Helper - Enhanced Poker Engine
-Uses treys library for hand evaluation and implements ICM calculations.
+Evaluates hands with precomputed lookup tables, vectorized with NumPy for Monte Carlo
+simulations, and implements ICM calculations.
 
 This module provides the core poker logic for the application, including:
 - Card representation and manipulation
@@ -11,28 +12,32 @@ This module provides the core poker logic for the application, including:
 - Decision making based on hand strength and position
 """
 from typing import List, Tuple, Dict, Set, Optional, Union, Any, Callable
+import atexit
 import random
 import itertools
-from collections import Counter
 import multiprocessing
-from functools import lru_cache
 import json
+import math
 import os
 from pathlib import Path
+import numpy as np
 
 try:
     from treys import Card as TreysCard
-    from treys import Evaluator as TreysEvaluator
     TREYS_AVAILABLE = True
 except ImportError:
     TREYS_AVAILABLE = False
-    print("Warning: treys library not available. Using built-in evaluator.")
+    print("Warning: treys library not available. Card.to_treys_card will return None.")
+
+# Directory holding the precomputed data files
+DATA_DIR = Path(__file__).resolve().parents[2] / 'data'
 
 # Define card constants
 SUITS = ['h', 'd', 'c', 's']  # hearts, diamonds, clubs, spades
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
 # Precompute rank values for faster lookup
 RANK_VALUES = {rank: idx for idx, rank in enumerate(RANKS)}
+SUIT_VALUES = {suit: idx for idx, suit in enumerate(SUITS)}
 
 # Mapping for converting between our card format and treys format
 SUIT_MAPPING = {'h': 'h', 'd': 'd', 'c': 'c', 's': 's'}
@@ -41,6 +46,583 @@ RANK_MAPPING = {
     'T': 'T', 'J': 'J', 'Q': 'Q', 'K': 'K', 'A': 'A'
 }
 
+# Bitboard layout: one 4-bit nibble per rank (2 in the lowest nibble), one bit per suit
+NIBBLE_LOW_BITS = 0x1111111111111  # Lowest bit of each of the 13 rank nibbles
+NIBBLE_PAIR_BITS = 0x5555555555555
+NIBBLE_QUAD_BITS = 0x3333333333333
+
+# Hand categories used by the exact hand score (category << 20 | five 4-bit kickers)
+HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT = 0, 1, 2, 3, 4
+FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = 5, 6, 7, 8
+
+def _pack_nibbles(bits: int) -> int:
+    """
+    Collapse every non-empty nibble of a bitboard into a single bit (SWAR packnibble).
+    
+    Args:
+        bits: Bitboard with one nibble per rank
+    
+    Returns:
+        13-bit mask with bit i set if rank i is present
+    """
+    bits = (bits | (bits >> 1) | (bits >> 2) | (bits >> 3)) & NIBBLE_LOW_BITS
+    bits = (bits | (bits >> 3)) & 0x3030303030303
+    bits = (bits | (bits >> 6)) & 0xF000F000F000F
+    bits = (bits | (bits >> 12)) & 0xFF000000FF
+    return (bits | (bits >> 24)) & 0x1FFF
+
+def _top_ranks(mask: int, count: int) -> List[int]:
+    """Return the `count` highest rank values present in a 13-bit rank mask."""
+    ranks: List[int] = []
+    while mask and len(ranks) < count:
+        rank = mask.bit_length() - 1
+        ranks.append(rank)
+        mask ^= 1 << rank
+    return ranks
+
+def _straight_high(mask: int) -> int:
+    """Return the high rank value of the best straight in a rank mask, or -1 if none."""
+    # Shift in the ace below the deuce so the wheel (A-5) is found by the same test
+    low_ace_mask = (mask << 1) | (mask >> 12)
+    runs = (low_ace_mask & (low_ace_mask >> 1) & (low_ace_mask >> 2)
+            & (low_ace_mask >> 3) & (low_ace_mask >> 4))
+    if not runs:
+        return -1
+    return runs.bit_length() + 2
+
+# Per 13-bit rank mask: number of ranks present and high rank of the best straight (or -1)
+RANK_MASK_COUNTS = [bin(mask).count('1') for mask in range(1 << 13)]
+STRAIGHT_HIGHS = [_straight_high(mask) for mask in range(1 << 13)]
+# Per 13-bit rank mask: its five highest ranks, in descending order
+TOP_RANKS = [_top_ranks(mask, 5) for mask in range(1 << 13)]
+
+def _make_score(category: int, ranks: List[int]) -> int:
+    """Pack a hand category and up to five kicker ranks into a comparable integer."""
+    score = category
+    for i in range(5):
+        score = (score << 4) | (ranks[i] if i < len(ranks) else 0)
+    return score
+
+def _hand_score(bits: int) -> int:
+    """
+    Evaluate a 5 to 7 card bitboard and return the score of its best 5-card hand.
+    
+    Higher scores are better and equal scores are exact ties, so the result can be
+    compared directly between players.
+    
+    Args:
+        bits: Bitboard built by OR-ing `Card.bit` of every card in the hand
+    
+    Returns:
+        Integer score of the form category << 20 | five 4-bit kicker ranks
+    """
+    rank_mask = _pack_nibbles(bits)
+    
+    # Flushes and straight flushes only depend on the ranks held in a single suit
+    for suit in range(4):
+        suit_mask = _pack_nibbles((bits >> suit) & NIBBLE_LOW_BITS)
+        if RANK_MASK_COUNTS[suit_mask] >= 5:
+            high = STRAIGHT_HIGHS[suit_mask]
+            if high >= 0:
+                return _make_score(STRAIGHT_FLUSH, [high])
+            flush_score = _make_score(FLUSH, TOP_RANKS[suit_mask])
+            break
+    else:
+        flush_score = 0
+    
+    # Per-nibble popcount gives the number of cards held of each rank
+    counts = bits - ((bits >> 1) & NIBBLE_PAIR_BITS)
+    counts = (counts & NIBBLE_QUAD_BITS) + ((counts >> 2) & NIBBLE_QUAD_BITS)
+    quads = _pack_nibbles((counts >> 2) & NIBBLE_LOW_BITS)
+    trips = _pack_nibbles(counts & (counts >> 1) & NIBBLE_LOW_BITS)
+    pairs = _pack_nibbles((counts >> 1) & ~counts & NIBBLE_LOW_BITS)
+    
+    if quads:
+        quad_rank = quads.bit_length() - 1
+        kickers = TOP_RANKS[rank_mask ^ (1 << quad_rank)][:1]
+        return _make_score(FOUR_OF_A_KIND, [quad_rank] + kickers)
+    if trips:
+        trip_rank = trips.bit_length() - 1
+        paired = pairs | (trips ^ (1 << trip_rank))
+        if paired:
+            return _make_score(FULL_HOUSE, [trip_rank, paired.bit_length() - 1])
+    if flush_score:
+        return flush_score
+    high = STRAIGHT_HIGHS[rank_mask]
+    if high >= 0:
+        return _make_score(STRAIGHT, [high])
+    if trips:
+        trip_rank = trips.bit_length() - 1
+        kickers = TOP_RANKS[rank_mask ^ (1 << trip_rank)][:2]
+        return _make_score(THREE_OF_A_KIND, [trip_rank] + kickers)
+    if pairs:
+        pair_ranks = TOP_RANKS[pairs][:2]
+        kicker_mask = rank_mask
+        for rank in pair_ranks:
+            kicker_mask ^= 1 << rank
+        if len(pair_ranks) == 2:
+            return _make_score(TWO_PAIR, pair_ranks + TOP_RANKS[kicker_mask][:1])
+        return _make_score(ONE_PAIR, pair_ranks + TOP_RANKS[kicker_mask][:3])
+    return _make_score(HIGH_CARD, TOP_RANKS[rank_mask])
+
+def _legacy_hand_value(score: int) -> int:
+    """
+    Convert an exact hand score into the category-banded value used by `_evaluate_hand`.
+    
+    The banded value is category * 1000 plus a category specific tiebreaker
+    (e.g. the sum of the ranks for a flush, or the pair rank for one pair).
+    """
+    category = score >> 20
+    r1, r2 = (score >> 16) & 0xF, (score >> 12) & 0xF
+    if category == FLUSH:
+        return 5000 + r1 + r2 + ((score >> 8) & 0xF) + ((score >> 4) & 0xF) + (score & 0xF)
+    if category == TWO_PAIR:
+        return 2000 + r1 * 20 + r2
+    if category == HIGH_CARD:
+        return r1
+    return category * 1000 + r1
+
+# Lookup-table evaluator (TwoPlusTwo style): a 5 to 7 card hand key is the sum of its card keys.
+# Rank counts take 3 bits per rank in the low bits, suit counts 4 bits per suit above them.
+RANK_KEY_BITS = 3
+SUIT_KEY_SHIFT = 40
+RANK_KEY_MASK = (1 << SUIT_KEY_SHIFT) - 1
+FLUSH_CHECK_BIAS = 0x3333  # Added to the suit counts so a count of 5+ sets the nibble's top bit
+FLUSH_CHECK_BITS = 0x8888
+
+# Built on first use: (rank multiset key -> score, 13-bit suited rank mask -> score)
+_LOOKUP_TABLES: Optional[Tuple[Dict[int, int], List[int]]] = None
+# Built on first use: 5 and 6-card rank multiset key -> score, only needed outside simulations
+_SHORT_RANK_TABLE: Optional[Dict[int, int]] = None
+
+def _rank_multiset_scores(num_cards: int) -> Dict[int, int]:
+    """
+    Score every multiset of `num_cards` ranks holding at most four cards of each rank.
+    
+    Args:
+        num_cards: Number of cards in the hand
+    
+    Returns:
+        Non-flush score per rank multiset key
+    """
+    rank_table: Dict[int, int] = {}
+    
+    def add_rank(rank: int, remaining: int, key: int, bits: int, dealt: int) -> None:
+        if rank == len(RANKS):
+            if remaining == 0:
+                rank_table[key] = _hand_score(bits)
+            return
+        for count in range(min(4, remaining) + 1):
+            rank_bits = bits
+            # Rotate suits across all cards so no multiset is accidentally a flush
+            for i in range(count):
+                rank_bits |= 1 << (rank * 4 + (dealt + i) % 4)
+            add_rank(rank + 1, remaining - count, key + (count << (RANK_KEY_BITS * rank)),
+                     rank_bits, dealt + count)
+    
+    add_rank(0, num_cards, 0, 0, 0)
+    return rank_table
+
+def _build_lookup_tables() -> Tuple[Dict[int, int], List[int]]:
+    """
+    Precompute the scores of every 7-card rank multiset and every suited rank mask.
+    
+    Scores are generated with the bitboard evaluator, so both tables agree with
+    `_hand_score` by construction.
+    
+    Returns:
+        Tuple of (non-flush score per rank multiset key, flush score per suited rank mask)
+    """
+    global _LOOKUP_TABLES
+    rank_table = _rank_multiset_scores(7)
+    
+    flush_table = [0] * (1 << len(RANKS))
+    for mask in range(len(flush_table)):
+        if RANK_MASK_COUNTS[mask] >= 5:
+            bits = 0
+            for rank in range(len(RANKS)):
+                if mask >> rank & 1:
+                    bits |= 1 << (rank * 4)
+            flush_table[mask] = _hand_score(bits)
+    
+    _LOOKUP_TABLES = (rank_table, flush_table)
+    return _LOOKUP_TABLES
+
+def _build_short_rank_table() -> Dict[int, int]:
+    """Precompute the scores of every 5 and 6-card rank multiset."""
+    global _SHORT_RANK_TABLE
+    # Keys of different hand sizes never collide, since their rank counts sum differently
+    _SHORT_RANK_TABLE = {**_rank_multiset_scores(5), **_rank_multiset_scores(6)}
+    return _SHORT_RANK_TABLE
+
+def _lookup_score(cards: List['Card']) -> int:
+    """
+    Score a 5 to 7 card hand with the precomputed lookup tables.
+    
+    Args:
+        cards: Five to seven distinct Card objects
+    
+    Returns:
+        The same exact score as `_hand_score` for these cards
+    """
+    rank_table, flush_table = _LOOKUP_TABLES or _build_lookup_tables()
+    if len(cards) < 7:
+        rank_table = _SHORT_RANK_TABLE or _build_short_rank_table()
+    key = 0
+    bits = 0
+    for card in cards:
+        key += card.lookup_key
+        bits |= card.bit
+    flush_suits = ((key >> SUIT_KEY_SHIFT) + FLUSH_CHECK_BIAS) & FLUSH_CHECK_BITS
+    if flush_suits:
+        # At most one suit can hold five of seven cards, and a flush then beats any
+        # pair-based hand the remaining (at most two) cards could make
+        suit = (flush_suits.bit_length() - 4) // 4
+        return flush_table[_pack_nibbles((bits >> suit) & NIBBLE_LOW_BITS)]
+    return rank_table[key & RANK_KEY_MASK]
+
+# Per-card arrays for the vectorized evaluator, indexed by Card.index (value * 4 + suit)
+CARD_LOOKUP_KEYS = np.array([(1 << (RANK_KEY_BITS * (i // 4))) |
+                             (1 << (SUIT_KEY_SHIFT + 4 * (i % 4))) for i in range(52)],
+                            dtype=np.int64)
+CARD_RANK_BITS = np.array([1 << (i // 4) for i in range(52)], dtype=np.int64)
+CARD_SUITS = np.array([i % 4 for i in range(52)], dtype=np.int8)
+DECK_SHIFTS = np.arange(52, dtype=np.int64)
+
+# Built on first use: (sorted rank multiset keys, their scores, flush score per suited rank mask)
+_ARRAY_TABLES: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+def _get_array_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the lookup tables as NumPy arrays for vectorized evaluation."""
+    global _ARRAY_TABLES
+    if _ARRAY_TABLES is None:
+        rank_table, flush_table = _LOOKUP_TABLES or _build_lookup_tables()
+        rank_keys = sorted(rank_table)
+        _ARRAY_TABLES = (np.array(rank_keys, dtype=np.int64),
+                         np.array([rank_table[key] for key in rank_keys], dtype=np.int32),
+                         np.array(flush_table, dtype=np.int32))
+    return _ARRAY_TABLES
+
+def warm_up() -> None:
+    """
+    Build the hand evaluation tables now instead of on the first calculation.
+    
+    Building them takes about half a second, so servers should call this at startup
+    (before forking workers, where possible) to keep it off the first request.
+    """
+    _get_array_tables()
+
+def _score_hands(card_indices: np.ndarray,
+                 board_indices: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Score many 7-card hands at once with the lookup tables.
+    
+    Args:
+        card_indices: Integer array of shape (..., k) holding `Card.index` values
+        board_indices: Optional array of shape (..., 7 - k), broadcastable with
+            `card_indices` in either direction, holding cards shared between hands (e.g.
+            the board for every opponent). Shared cards are only summed once.
+    
+    Returns:
+        Array of shape (...) with the `_hand_score` of every hand
+    """
+    rank_keys, rank_scores, flush_table = _get_array_tables()
+    keys = CARD_LOOKUP_KEYS[card_indices].sum(axis=-1)
+    if board_indices is not None:
+        keys = keys + CARD_LOOKUP_KEYS[board_indices].sum(axis=-1)
+    scores: np.ndarray = rank_scores[np.searchsorted(rank_keys, keys & RANK_KEY_MASK)]
+    
+    # Only hands with five or more cards of one suit need the flush table
+    flush_hands = (((keys >> SUIT_KEY_SHIFT) + FLUSH_CHECK_BIAS) & FLUSH_CHECK_BITS) != 0
+    if flush_hands.any():
+        # Either side may be broadcast, so expand both to one row per hand before selecting
+        flush_cards = np.broadcast_to(card_indices, keys.shape + card_indices.shape[-1:])
+        flush_cards = flush_cards[flush_hands]
+        if board_indices is not None:
+            board_shape = keys.shape + board_indices.shape[-1:]
+            flush_cards = np.concatenate(
+                [flush_cards, np.broadcast_to(board_indices, board_shape)[flush_hands]], axis=-1)
+        rank_bits = CARD_RANK_BITS[flush_cards]
+        suits = CARD_SUITS[flush_cards]
+        flush_scores = scores[flush_hands]
+        for suit in range(4):
+            suited_mask = np.where(suits == suit, rank_bits, 0).sum(axis=-1)
+            flush_scores = np.maximum(flush_scores, flush_table[suited_mask])
+        scores[flush_hands] = flush_scores
+    return scores
+
+def _wilson_margin(wins: int, trials: int, z: float = 1.96) -> float:
+    """
+    Half-width of the Wilson score interval for a win rate.
+    
+    Args:
+        wins: Number of simulations won
+        trials: Number of simulations run
+        z: Standard normal quantile of the confidence level (1.96 for 95%)
+    
+    Returns:
+        float: Half-width of the confidence interval around wins / trials
+    """
+    p = wins / trials
+    spread = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials))
+    return spread / (1 + z * z / trials)
+
+def _exact_equity(hole: Tuple[int, ...], board: Tuple[int, ...], available_mask: int,
+                  num_players: int, range_hands: Optional[np.ndarray] = None) -> Optional[float]:
+    """
+    Compute turn or river equity exactly by scoring every hand an opponent can hold
+    with every river card still to come.
+    
+    Heads-up equity is the share of (river, opponent hand) deals that don't beat ours.
+    With more opponents it is only exact when no such deal beats ours at all.
+    
+    Args:
+        hole: `Card.index` values of the player's hole cards
+        board: `Card.index` values of four or five community cards
+        available_mask: Bitmask of the cards left in the deck, one bit per `Card.index`
+        num_players: Number of players at the table
+        range_hands: Optional int array of shape (n, 2) holding the opponents' possible
+            hole cards, none of which overlap `hole` or `board`
+    
+    Returns:
+        The exact equity, or None if it has to be simulated
+    """
+    live = np.flatnonzero((np.int64(available_mask) >> DECK_SHIFTS) & 1).astype(np.int8)
+    if range_hands is None:
+        range_hands = live[np.stack(np.triu_indices(len(live), 1), axis=-1)]
+    
+    # One row per possible river, or a single row when the board is complete
+    if len(board) == 4:
+        boards = np.empty((len(live), 5), dtype=np.int8)
+        boards[:, :4] = board
+        boards[:, 4] = live
+        # Opponents can't hold the river card
+        dealable = (range_hands[None, :, :] != live[:, None, None]).all(axis=-1)
+    else:
+        boards = np.array([board], dtype=np.int8)
+        dealable = np.ones((1, len(range_hands)), dtype=bool)
+    
+    # Deals that reuse the river card would score duplicate cards, so give the opponent
+    # our hole cards there instead. Those deals are masked out below anyway.
+    hole_indices = np.array(hole, dtype=np.int8)
+    opponent_holes = np.where(dealable[:, :, None], range_hands[None, :, :], hole_indices)
+    
+    my_scores = _score_hands(boards, hole_indices[None, :])
+    opponent_scores = _score_hands(opponent_holes, boards[:, None, :])
+    beaten = (opponent_scores > my_scores[:, None]) & dealable
+    
+    # Ties count as wins, like in the simulations
+    if num_players == 2:
+        return 1.0 - float(np.count_nonzero(beaten)) / float(np.count_nonzero(dealable))
+    if not beaten.any():
+        return 1.0
+    return None
+
+def _canonical_cards(hole: List[int], board: List[int]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Relabel suits so that all suit-isomorphic deals map to the same cards.
+    
+    Each suit is described by the ranks it holds in the hole and on the board, and
+    suits are renumbered in the sorted order of those descriptions. Suits with equal
+    descriptions are interchangeable, so ties don't affect the result.
+    
+    Args:
+        hole: `Card.index` values of the hole cards
+        board: `Card.index` values of the known community cards
+        
+    Returns:
+        Tuple of sorted hole card indices and sorted board indices after relabelling
+    """
+    signatures = [(sorted(index // 4 for index in hole if index % 4 == suit),
+                   sorted(index // 4 for index in board if index % 4 == suit))
+                  for suit in range(4)]
+    relabel = [0] * 4
+    for new_suit, suit in enumerate(sorted(range(4), key=signatures.__getitem__)):
+        relabel[suit] = new_suit
+    return (tuple(sorted(index - index % 4 + relabel[index % 4] for index in hole)),
+            tuple(sorted(index - index % 4 + relabel[index % 4] for index in board)))
+
+# Simulations run in rounds of this size until the equity's 95% confidence interval
+# is narrower than +/- EQUITY_MARGIN
+SIMULATION_ROUND_SIZE = 500
+EQUITY_MARGIN = 0.02
+
+# Maximum number of memoized simulated equities before the memo is reset
+EQUITY_CACHE_SIZE = 4096
+
+# Worker processes for Monte Carlo simulations, started on first use and shared by all engines
+_SIMULATION_POOL: Optional[Any] = None
+
+def _init_simulation_worker() -> None:
+    """Build the lookup tables once per worker instead of once per simulation batch."""
+    _get_array_tables()
+
+def _get_simulation_pool(processes: int) -> Any:
+    """
+    Return the shared simulation pool, creating it on first use.
+    
+    Args:
+        processes: Number of worker processes to start if the pool doesn't exist yet
+        
+    Returns:
+        multiprocessing.pool.Pool: The shared worker pool
+    """
+    global _SIMULATION_POOL
+    if _SIMULATION_POOL is None:
+        # Forked workers inherit tables that are already built
+        _get_array_tables()
+        _SIMULATION_POOL = multiprocessing.Pool(processes=processes,
+                                                initializer=_init_simulation_worker)
+    return _SIMULATION_POOL
+
+@atexit.register
+def close_simulation_pool() -> None:
+    """Shut down the shared simulation pool, if it was started."""
+    global _SIMULATION_POOL
+    if _SIMULATION_POOL is not None:
+        _SIMULATION_POOL.terminate()
+        _SIMULATION_POOL.join()
+        _SIMULATION_POOL = None
+
+def _deal_cards(rng: np.random.Generator, dead: np.ndarray, num_simulations: int,
+                num_cards: int) -> np.ndarray:
+    """
+    Deal cards for many simulations at once with a partial Fisher-Yates shuffle.
+    
+    Only the first `num_cards` positions of each deck are shuffled, since the rest
+    are never dealt.
+    
+    Args:
+        rng: NumPy random generator
+        dead: Boolean array of shape (52,) or (num_simulations, 52) marking cards
+            that can't be dealt
+        num_simulations: Number of decks to deal from
+        num_cards: Number of cards to deal from each deck
+        
+    Returns:
+        Array of shape (num_simulations, num_cards) holding `Card.index` values
+    """
+    if dead.ndim == 1:
+        decks = np.tile(np.flatnonzero(~dead).astype(np.int8), (num_simulations, 1))
+        deck_sizes = decks.shape[1]
+    else:
+        # Move each row's live cards to the front, keeping them in order
+        decks = np.argsort(dead, axis=1, kind='stable').astype(np.int8)
+        deck_sizes = 52 - dead.sum(axis=1)
+    
+    rows = np.arange(num_simulations)
+    for i in range(num_cards):
+        picks = i + (rng.random(num_simulations) * (deck_sizes - i)).astype(np.intp)
+        chosen = decks[rows, picks]
+        decks[rows, picks] = decks[:, i]
+        decks[:, i] = chosen
+    return decks[:, :num_cards]
+
+# Random redraws per opponent before picking directly among the range hands still open
+RANGE_REDRAWS = 4
+# Times a simulation is dealt again when its opponents run out of range hands
+RANGE_DEAL_ATTEMPTS = 100
+
+def _deal_range_hands(rng: np.random.Generator, range_hands: np.ndarray, num_simulations: int,
+                      num_opponents: int) -> np.ndarray:
+    """
+    Deal every opponent a hand from a range, with no card dealt twice in a simulation.
+    
+    Opponents are dealt one at a time, each uniformly from the range hands that share no
+    card with the hands already dealt. Random picks that clash are redrawn, which is cheap
+    for wide ranges, and the few that keep clashing pick directly among the open hands.
+    Simulations where a later opponent has no open hand left are dealt again from the start.
+    
+    Args:
+        rng: NumPy random generator
+        range_hands: Int array of shape (n, 2) holding the possible hole cards
+        num_simulations: Number of simulations to deal for
+        num_opponents: Number of opponents in each simulation
+        
+    Returns:
+        Array of shape (num_simulations, num_opponents, 2) holding `Card.index` values
+        
+    Raises:
+        ValueError: If the range is too narrow to deal every opponent a distinct hand
+    """
+    opponent_holes = np.empty((num_simulations, num_opponents, 2), dtype=range_hands.dtype)
+    pending = np.arange(num_simulations)
+    for _ in range(RANGE_DEAL_ATTEMPTS):
+        held = np.zeros((len(pending), 52), dtype=bool)
+        rows = np.arange(len(pending))
+        stuck = np.zeros(len(pending), dtype=bool)
+        for seat in range(num_opponents):
+            picks = rng.integers(len(range_hands), size=len(pending))
+            clashes = rows[held[rows[:, None], range_hands[picks]].any(axis=1)]
+            for _ in range(RANGE_REDRAWS):
+                if not len(clashes):
+                    break
+                picks[clashes] = rng.integers(len(range_hands), size=len(clashes))
+                clashes = clashes[held[clashes[:, None], range_hands[picks[clashes]]].any(axis=1)]
+            if len(clashes):
+                open_hands = ~held[clashes][:, range_hands].any(axis=2)
+                counts = open_hands.sum(axis=1)
+                targets = (rng.random(len(clashes)) * counts).astype(np.intp)
+                picks[clashes] = (np.cumsum(open_hands, axis=1) > targets[:, None]).argmax(axis=1)
+                stuck[clashes] = counts == 0
+            opponent_holes[pending, seat] = range_hands[picks]
+            held[rows[:, None], range_hands[picks]] = True
+        pending = pending[stuck]
+        if not len(pending):
+            return opponent_holes
+    raise ValueError(f"Opponent range is too narrow to deal {num_opponents} distinct hands")
+
+# Starting hand keys ("A-K", "A-Ks", "Q-Q") indexed by (high value, low value, suited)
+PREFLOP_KEYS: Dict[Tuple[int, int, bool], str] = {
+    (high, low, suited): f"{RANKS[high]}-{RANKS[low]}" + ("s" if suited and high != low else "")
+    for high in range(len(RANKS))
+    for low in range(high + 1)
+    for suited in (False, True)
+}
+
+# Suited hands play one position category better than their offsuit version
+SUITED_UPGRADES: Dict[str, str] = {'mid_late': 'any', 'late': 'mid_late', 'unplayable': 'late'}
+
+# Fixed strengths of premium starting hands, used instead of simulating them
+PREMIUM_STRENGTHS: Dict[str, float] = {
+    'A-A': 0.85, 'K-K': 0.82, 'Q-Q': 0.80,
+    'A-K': 0.75, 'A-Ks': 0.75, 'A-Q': 0.72, 'A-Qs': 0.72,
+}
+
+# Action rules per stack depth and position: (action, threshold, Monte Carlo threshold),
+# checked in order and scaled by the ICM factor. A hand matching no rule is folded.
+# Positions other than early, middle and late use the 'other' rules.
+_UNKNOWN_STACK_LATE = (("Raise", 0.6, 0.30), ("Call", 0.4, 0.22))
+_SHORT_STACK = (("All-In", 0.5, 0.30),)
+_MEDIUM_STACK = (("Raise", 0.65, 0.32), ("Call", 0.5, 0.28))
+_DEEP_STACK_LATE = (("Raise", 0.6, 0.30), ("Call", 0.45, 0.23))
+ACTION_RULES: Dict[str, Dict[str, Tuple[Tuple[str, float, float], ...]]] = {
+    'unknown': {
+        'early': (("Raise", 0.7, 0.35), ("Call", 0.5, 0.28)),
+        'middle': (("Raise", 0.65, 0.32), ("Call", 0.45, 0.25)),
+        'late': _UNKNOWN_STACK_LATE,
+        'other': _UNKNOWN_STACK_LATE,
+    },
+    'short': {
+        'early': _SHORT_STACK,
+        'middle': _SHORT_STACK,
+        'late': _SHORT_STACK + (("All-In", 0.45, 0.25),),
+        'other': _SHORT_STACK,
+    },
+    'medium': {
+        'early': (("Raise", 0.65, 0.32),),
+        'middle': _MEDIUM_STACK,
+        'late': _MEDIUM_STACK + (("Call", 0.4, 0.24),),
+        'other': _MEDIUM_STACK,
+    },
+    'deep': {
+        'early': (("Raise", 0.7, 0.35), ("Call", 0.55, 0.30)),
+        'middle': (("Raise", 0.65, 0.32), ("Call", 0.5, 0.27)),
+        'late': _DEEP_STACK_LATE,
+        'other': _DEEP_STACK_LATE,
+    },
+}
+
 class Card:
     """
     Represents a playing card with optimized memory usage and comparison operations.
@@ -49,8 +631,11 @@ class Card:
         rank (str): The rank of the card (2-9, T, J, Q, K, A)
         suit (str): The suit of the card (h, d, c, s)
         value (int): Numeric value of the rank for comparison
+        index (int): Position of the card in a value-major deck (value * 4 + suit)
+        bit (int): Single-bit bitboard of the card for the bitmask hand evaluator
+        lookup_key (int): Rank and suit count increments for the lookup-table evaluator
     """
-    __slots__ = ('rank', 'suit', 'value')
+    __slots__ = ('rank', 'suit', 'value', 'index', 'bit', 'lookup_key')
     
     def __init__(self, rank: str, suit: str) -> None:
         """
@@ -63,6 +648,10 @@ class Card:
         self.rank = rank
         self.suit = suit
         self.value = RANK_VALUES[rank]  # Precompute the value for faster comparisons
+        self.index = self.value * 4 + SUIT_VALUES[suit]
+        self.bit = 1 << self.index
+        self.lookup_key = ((1 << (RANK_KEY_BITS * self.value))
+                           | (1 << (SUIT_KEY_SHIFT + 4 * SUIT_VALUES[suit])))
     
     def __str__(self) -> str:
         """Return string representation of the card (e.g., 'Ah')."""
@@ -73,13 +662,13 @@ class Card:
         return self.__str__()
     
     def __eq__(self, other):
-        if not other:
+        if not isinstance(other, Card):
             return False
-        return self.rank == other.rank and self.suit == other.suit
+        return self.index == other.index
     
     def __hash__(self):
-        # Implement hash for faster set operations and caching
-        return hash((self.rank, self.suit))
+        # The deck index is unique per card, so it doubles as a cheap hash
+        return self.index
     
     def to_treys_card(self):
         """Convert to treys card format if available."""
@@ -94,6 +683,11 @@ class HandRange:
     """
     def __init__(self, range_str=None):
         self.hands = set()
+        # Private generator so concurrent requests don't contend on the global random lock
+        self._rng = random.Random()
+        # Built on first use and reset whenever a hand is added
+        self._hand_list = None
+        self._card_indices = None
         if range_str:
             self.parse_range(range_str)
     
@@ -106,15 +700,15 @@ class HandRange:
             # Handle pair ranges like "22+"
             if len(part) >= 3 and part[0] == part[1] and part[2] == '+':
                 start_rank = part[0]
-                start_idx = RANKS.index(start_rank)
+                start_idx = RANK_VALUES[start_rank]
                 for rank in RANKS[start_idx:]:
                     self.add_pair(rank)
             
             # Handle suited ranges like "ATs+"
             elif len(part) >= 4 and part[2] == 's' and part[3] == '+':
                 high_rank, low_rank = part[0], part[1]
-                high_idx = RANKS.index(high_rank)
-                low_idx = RANKS.index(low_rank)
+                high_idx = RANK_VALUES[high_rank]
+                low_idx = RANK_VALUES[low_rank]
                 
                 for i in range(low_idx, high_idx):
                     self.add_suited(high_rank, RANKS[i])
@@ -122,8 +716,8 @@ class HandRange:
             # Handle offsuit ranges like "ATo+"
             elif len(part) >= 4 and part[2] == 'o' and part[3] == '+':
                 high_rank, low_rank = part[0], part[1]
-                high_idx = RANKS.index(high_rank)
-                low_idx = RANKS.index(low_rank)
+                high_idx = RANK_VALUES[high_rank]
+                low_idx = RANK_VALUES[low_rank]
                 
                 for i in range(low_idx, high_idx):
                     self.add_offsuit(high_rank, RANKS[i])
@@ -145,117 +739,151 @@ class HandRange:
                 self.add_suited(part[0], part[1])
                 self.add_offsuit(part[0], part[1])
     
+    def add_hand(self, card1, card2):
+        """Add a single hand, given as two card strings like 'Ah', to the range."""
+        self.hands.add((card1, card2))
+        self._hand_list = None
+        self._card_indices = None
+    
     def add_pair(self, rank):
         """Add all combinations of a pair to the range."""
         for s1, s2 in itertools.combinations(SUITS, 2):
-            self.hands.add((f"{rank}{s1}", f"{rank}{s2}"))
+            self.add_hand(f"{rank}{s1}", f"{rank}{s2}")
     
     def add_suited(self, high_rank, low_rank):
         """Add all suited combinations of two ranks to the range."""
         for suit in SUITS:
-            self.hands.add((f"{high_rank}{suit}", f"{low_rank}{suit}"))
+            self.add_hand(f"{high_rank}{suit}", f"{low_rank}{suit}")
     
     def add_offsuit(self, high_rank, low_rank):
         """Add all offsuit combinations of two ranks to the range."""
-        for s1, s2 in itertools.product(SUITS, SUITS):
-            if s1 != s2:
-                self.hands.add((f"{high_rank}{s1}", f"{low_rank}{s2}"))
+        for s1 in SUITS:
+            for s2 in SUITS:
+                if s1 != s2:
+                    self.add_hand(f"{high_rank}{s1}", f"{low_rank}{s2}")
     
     def get_random_hand(self):
         """Get a random hand from the range."""
         if not self.hands:
             return None
-        return random.choice(list(self.hands))
+        if self._hand_list is None:
+            self._hand_list = list(self.hands)
+        return self._rng.choice(self._hand_list)
+    
+    def card_indices(self):
+        """
+        Get the hands of the range as card indices.
+        
+        Returns:
+            np.ndarray: Int8 array of shape (len(self), 2) holding the `Card.index` of
+                both cards of every hand
+        """
+        if self._card_indices is None:
+            self._card_indices = np.array(
+                [[RANK_VALUES[card_str[0]] * 4 + SUIT_VALUES[card_str[1]] for card_str in hand]
+                 for hand in self.hands], dtype=np.int8).reshape(-1, 2)
+        return self._card_indices
     
     def __len__(self):
         return len(self.hands)
 
 class PokerEngine:
     """
-    Enhanced poker engine that uses treys for hand evaluation when available
+    Enhanced poker engine that evaluates hands with precomputed lookup tables
     and implements ICM calculations.
     """
     def __init__(self):
         # Precompute the deck once
         self.deck = [Card(rank, suit) for rank in RANKS for suit in SUITS]
-        # Create a lookup dictionary for faster card retrieval
-        self.card_lookup = {f"{rank}{suit}": Card(rank, suit) for rank in RANKS for suit in SUITS}
-        # Number of CPU cores for parallel processing
-        self.num_cores = max(1, multiprocessing.cpu_count() - 1)  # Leave one core free
-        
-        # Initialize treys evaluator if available
-        self.treys_evaluator = TreysEvaluator() if TREYS_AVAILABLE else None
+        # Bitboard of the full deck, one bit per Card.index
+        self.deck_mask = (1 << len(self.deck)) - 1
+        # Create a lookup dictionary for faster card retrieval, sharing the deck's Card objects
+        self.card_lookup = {str(card): card for card in self.deck}
+        # Number of CPU cores for parallel processing, leaving one core free by default.
+        # Set POKER_ENGINE_PROCESSES=1 when the server already runs a worker per core.
+        self.num_cores = max(1, int(os.environ.get('POKER_ENGINE_PROCESSES',
+                                                   multiprocessing.cpu_count() - 1)))
         
         # Load precomputed starting hand values
         self.starting_hands = self._load_starting_hands()
+        self.starting_hand_categories = self._build_starting_hand_categories()
+        # Load precomputed preflop equity against random opponents
+        self.preflop_equity = self._load_preflop_equity()
+        # Memo of simulated equities keyed by canonical (hole, board, num_players)
+        self._equity_cache: Dict[Tuple[Tuple[int, ...], Tuple[int, ...], int], float] = {}
         
     def _load_starting_hands(self):
         """Load precomputed starting hand values from JSON file."""
         try:
-            file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                                    'texas_holdem_starting_hands.json')
-            with open(file_path, 'r') as f:
+            with open(DATA_DIR / 'texas_holdem_starting_hands.json', 'r') as f:
                 return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             print("Warning: Could not load starting hands file. Using default calculations.")
             return {}
         
+    def _build_starting_hand_categories(self):
+        """Resolve the position category of all 169 starting hands once."""
+        categories = {}
+        for (high, low, suited), key in PREFLOP_KEYS.items():
+            base_key = PREFLOP_KEYS[(high, low, False)]
+            if key != base_key and base_key in self.starting_hands:
+                # Suited hands are generally stronger than unsuited
+                category = self.starting_hands[base_key]
+                categories[key] = SUITED_UPGRADES.get(category, category)
+            else:
+                # Default to unplayable if not found
+                categories[key] = self.starting_hands.get(key, 'unplayable')
+        return categories
+    
+    def _load_preflop_equity(self):
+        """Load the precomputed preflop equity table, keyed by starting hand and player count."""
+        try:
+            with open(DATA_DIR / 'preflop_equity.json', 'r') as f:
+                table = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            print("Warning: Could not load preflop equity file. Using Monte Carlo simulation.")
+            return {}
+        return {key: {int(num_players): equity for num_players, equity in equities.items()}
+                for key, equities in table.items()}
+    
     def get_starting_hand_key(self, hole_cards):
         """Get the key for the starting hand in the format used in the JSON file."""
-        # Sort cards by rank value (higher first)
-        sorted_cards = sorted(hole_cards, key=lambda card: card.value, reverse=True)
-        
-        # Check if suited
-        suited = sorted_cards[0].suit == sorted_cards[1].suit
+        card1, card2 = hole_cards[0], hole_cards[1]
+        # Higher card first
+        if card1.value < card2.value:
+            card1, card2 = card2, card1
         
-        # Create key in format "A-K" (for unsuited) or "A-Ks" (for suited)
-        key = f"{sorted_cards[0].rank}-{sorted_cards[1].rank}"
-        if suited and sorted_cards[0].rank != sorted_cards[1].rank:
-            key += "s"
-            
-        return key
+        # Keys are "A-K" (for unsuited) or "A-Ks" (for suited)
+        return PREFLOP_KEYS[(card1.value, card2.value, card1.suit == card2.suit)]
         
     def get_starting_hand_strength(self, hole_cards):
         """
         Get the strength category of a starting hand based on precomputed values.
         Returns: 'any', 'mid_late', 'late', or 'unplayable'
         """
-        key = self.get_starting_hand_key(hole_cards)
-        
-        # Handle suited hands by removing the 's' and checking if it exists
-        if key.endswith('s'):
-            base_key = key[:-1]
-            # Suited hands are generally stronger than unsuited
-            if base_key in self.starting_hands:
-                category = self.starting_hands[base_key]
-                # Upgrade the category for suited hands
-                if category == 'mid_late':
-                    return 'any'
-                elif category == 'late':
-                    return 'mid_late'
-                elif category == 'unplayable':
-                    return 'late'
-                return category
-        
-        # For pairs and unsuited hands, check directly
-        if key in self.starting_hands:
-            return self.starting_hands[key]
-            
-        # Default to unplayable if not found
-        return 'unplayable'
+        return self.starting_hand_categories[self.get_starting_hand_key(hole_cards)]
         
     def parse_card(self, card_str):
         """Parse a card string like 'Ah' into a Card object using the lookup table."""
         if not card_str or len(card_str) != 2:
             return None
         
+        # Most cards arrive already normalized, e.g. 'Ah'
+        card = self.card_lookup.get(card_str)
+        if card is not None:
+            return card
+        
         # Normalize the card string
         card_key = f"{card_str[0].upper()}{card_str[1].lower()}"
         return self.card_lookup.get(card_key)
     
     def calculate_hand_strength(self, hole_cards, num_players, known_community_cards=None, opponent_range=None):
         """
-        Calculate the strength of the current hand using parallel processing.
+        Calculate the strength of the current hand.
+        
+        Premium and preflop hands are answered from precomputed tables, turn and river
+        spots are enumerated exactly where that settles the equity, and everything else
+        is estimated with Monte Carlo simulation.
         
         Args:
             hole_cards: List of Card objects representing the player's hole cards
@@ -266,32 +894,67 @@ class PokerEngine:
         Returns:
             float: Hand strength as a value between 0 and 1
         """
-        # For premium starting hands, use higher base values
-        # Check for premium pairs (AA, KK, QQ)
-        if hole_cards[0].rank == hole_cards[1].rank and hole_cards[0].value >= RANK_VALUES['Q']:
-            # AA: 0.85, KK: 0.82, QQ: 0.80
-            if hole_cards[0].rank == 'A':
-                return 0.85
-            elif hole_cards[0].rank == 'K':
-                return 0.82
-            elif hole_cards[0].rank == 'Q':
-                return 0.80
-        # Premium non-pairs (AK, AQ)
-        elif hole_cards[0].value == RANK_VALUES['A'] or hole_cards[1].value == RANK_VALUES['A']:
-            if 'K' in [hole_cards[0].rank, hole_cards[1].rank]:
-                return 0.75
-            elif 'Q' in [hole_cards[0].rank, hole_cards[1].rank]:
-                return 0.72
+        # For premium starting hands (AA, KK, QQ, AK, AQ), use higher base values
+        key = self.get_starting_hand_key(hole_cards)
+        if key in PREMIUM_STRENGTHS:
+            return PREMIUM_STRENGTHS[key]
+        
+        # Preflop equity against random hands comes straight from the precomputed table
+        if not known_community_cards and opponent_range is None:
+            equities = self.preflop_equity.get(key, {})
+            if num_players in equities:
+                return equities[num_players]
         
         # For all other hands, use Monte Carlo simulation with optimizations
-            
-        # Remove hole cards and known community cards from deck
-        used_cards = set(hole_cards)
-        if known_community_cards:
-            used_cards.update(known_community_cards)
-            
-        # Use set operations for faster filtering
-        available_deck = [card for card in self.deck if card not in used_cards]
+        if opponent_range is not None:
+            return self._simulate_equity(hole_cards, num_players, known_community_cards,
+                                         opponent_range)
+        
+        # Suit-isomorphic situations have the same equity, so they share one cached result
+        hole, board = _canonical_cards([card.index for card in hole_cards],
+                                       [card.index for card in known_community_cards or []])
+        return self._cached_equity(hole, board, num_players)
+    
+    def _cached_equity(self, hole: Tuple[int, ...], board: Tuple[int, ...],
+                       num_players: int) -> float:
+        """Memoized Monte Carlo equity for a canonical set of hole and community cards."""
+        key = (hole, board, num_players)
+        equity = self._equity_cache.get(key)
+        if equity is None:
+            # Keep the memo bounded, like the ICM calculator's
+            if len(self._equity_cache) >= EQUITY_CACHE_SIZE:
+                self._equity_cache.clear()
+            equity = self._equity_cache[key] = self._simulate_equity(
+                [self.deck[index] for index in hole], num_players,
+                [self.deck[index] for index in board] or None)
+        return equity
+    
+    def _simulate_equity(self, hole_cards, num_players, known_community_cards=None,
+                         opponent_range=None):
+        """Estimate the equity of a hand with Monte Carlo simulation."""
+        # Workers only receive small ints: card indices and a bitmask of the remaining deck
+        hole = tuple(card.index for card in hole_cards)
+        board = tuple(card.index for card in known_community_cards or [])
+        used_mask = 0
+        for card in hole_cards + (known_community_cards or []):
+            used_mask |= card.bit
+        available_mask = self.deck_mask & ~used_mask
+        
+        # Parse the opponent range once, dropping hands that hold one of our known cards
+        range_hands = None
+        if opponent_range is not None:
+            hands = opponent_range.card_indices()
+            available = ((np.int64(available_mask) >> DECK_SHIFTS) & 1).astype(bool)
+            hands = hands[available[hands].all(axis=1)]
+            if len(hands):
+                range_hands = hands
+        
+        # Every deal left can be scored on the river, and on the turn when heads-up (about 2 ms),
+        # so skip simulating when that settles the equity
+        if len(board) == 5 or (len(board) == 4 and num_players == 2):
+            equity = _exact_equity(hole, board, available_mask, num_players, range_hands)
+            if equity is not None:
+                return equity
         
         # Determine number of simulations based on community cards
         # If we have community cards, we need fewer simulations as there's less uncertainty
@@ -303,171 +966,123 @@ class PokerEngine:
         else:
             num_simulations = base_simulations
             
+        # For heads-up or 3-player games, we can use fewer simulations
+        if num_players <= 3:
+            num_simulations = max(1000, num_simulations // 2)
+        
+        # Run the simulations in rounds and stop once the equity is known precisely enough.
+        # Each worker gets a full round so dispatch overhead stays small next to the work.
+        workers = self._simulation_workers(num_players)
+        wins = 0
+        completed = 0
+        while completed < num_simulations:
+            round_size = min(SIMULATION_ROUND_SIZE * workers, num_simulations - completed)
+            wins += self._run_simulations(hole, board, available_mask, num_players, round_size,
+                                          range_hands)
+            completed += round_size
+            if _wilson_margin(wins, completed) < EQUITY_MARGIN:
+                break
+        
+        # Ensure the result is between 0 and 1
+        return max(0.0, min(1.0, wins / completed))
+    
+    def _simulation_workers(self, num_players):
+        """Return how many processes simulations for this table size should use."""
         # For small number of players, parallel processing overhead might not be worth it
         if num_players <= 3:
-            # For heads-up or 3-player games, we can use fewer simulations
-            wins = self._run_simulation_batch(hole_cards, available_deck, num_players, known_community_cards, 
-                                             max(1000, num_simulations // 2), opponent_range)
-            # Ensure the result is between 0 and 1
-            return max(0.0, min(1.0, wins / max(1000, num_simulations // 2)))
-        
-        # Determine number of simulations per process
-        simulations_per_process = num_simulations // self.num_cores
-        
-        # Create a pool of worker processes
-        with multiprocessing.Pool(processes=self.num_cores) as pool:
-            # Prepare arguments for each worker process
-            args = []
-            for i in range(self.num_cores):
-                # Create a deep copy of the cards to avoid shared references
-                hole_cards_copy = [Card(card.rank, card.suit) for card in hole_cards]
-                community_cards_copy = None
-                if known_community_cards:
-                    community_cards_copy = [Card(card.rank, card.suit) for card in known_community_cards]
-                
-                args.append((hole_cards_copy, available_deck.copy(), num_players, 
-                           community_cards_copy, simulations_per_process, opponent_range))
-            
-            # Run simulations in parallel
-            results = pool.starmap(self._run_simulation_batch, args)
-            
+            return 1
+        return self.num_cores
+    
+    def _run_simulations(self, hole, board, available_mask, num_players, num_simulations,
+                         range_hands=None):
+        """Run simulations in-process or split across the shared worker pool."""
+        if self._simulation_workers(num_players) <= 1:
+            return self._run_simulation_batch(hole, board, available_mask, num_players,
+                                              num_simulations, range_hands)
+        
+        # Split the simulations evenly across the shared worker pool
+        pool = _get_simulation_pool(self.num_cores)
+        chunk_sizes = [num_simulations // self.num_cores +
+                       (1 if i < num_simulations % self.num_cores else 0)
+                       for i in range(self.num_cores)]
+        args = [(hole, board, available_mask, num_players, chunk_size, range_hands)
+                for chunk_size in chunk_sizes]
+        results = pool.starmap(PokerEngine._run_simulation_batch, args)
+        
         # Combine results from all processes
-        total_wins = sum(results)
-        # Ensure the result is between 0 and 1
-        return max(0.0, min(1.0, total_wins / num_simulations))
+        return sum(results)
     
-    def _run_simulation_batch(self, hole_cards, available_deck, num_players, known_community_cards, num_simulations, opponent_range=None):
-        """Run a batch of simulations in a separate process."""
-        wins = 0
+    @staticmethod
+    def _run_simulation_batch(hole, board, available_mask, num_players, num_simulations,
+                              range_hands=None):
+        """
+        Run a batch of simulations as vectorized NumPy operations.
         
-        for _ in range(num_simulations):
-            # Shuffle the deck
-            random.shuffle(available_deck)
-            
-            # Deal remaining community cards if needed
-            if known_community_cards:
-                num_needed = 5 - len(known_community_cards)
-                community_cards = known_community_cards + available_deck[:num_needed]
-                offset = num_needed
-            else:
-                community_cards = available_deck[:5]
-                offset = 5
-            
-            # Calculate our best hand
-            my_hand_cards = hole_cards + community_cards
-            
-            # Use treys evaluator if available, otherwise use our built-in evaluator
-            if TREYS_AVAILABLE and self.treys_evaluator:
-                my_treys_hand = [card.to_treys_card() for card in hole_cards]
-                board_cards = [card.to_treys_card() for card in community_cards]
-                my_score = self.treys_evaluator.evaluate(board_cards, my_treys_hand)
-                # Note: In treys, lower scores are better
-            else:
-                my_best_hand = self._best_hand_value(my_hand_cards)
-            
-            # Check against other players
-            is_winner = True
-            
-            # Early exit optimization: check if we have a very strong hand with our evaluator
-            if not TREYS_AVAILABLE and my_best_hand >= 7000:  # Four of a kind or better
-                wins += 1
-                continue
-                
-            for player in range(num_players - 1):
-                # Deal hole cards to opponent based on range if provided
-                if opponent_range and len(opponent_range) > 0:
-                    # Get a random hand from the opponent's range
-                    opponent_cards = opponent_range.get_random_hand()
-                    if opponent_cards:
-                        opponent_hole_cards = [self.parse_card(opponent_cards[0]), self.parse_card(opponent_cards[1])]
-                    else:
-                        # Fallback to random cards if range is empty
-                        opponent_hole_cards = [available_deck[offset + player*2], available_deck[offset + player*2 + 1]]
-                else:
-                    # Use random cards from the deck
-                    opponent_hole_cards = [available_deck[offset + player*2], available_deck[offset + player*2 + 1]]
-                
-                opponent_hand_cards = opponent_hole_cards + community_cards
-                
-                # Use treys evaluator if available
-                if TREYS_AVAILABLE and self.treys_evaluator:
-                    opponent_treys_hand = [card.to_treys_card() for card in opponent_hole_cards]
-                    opponent_score = self.treys_evaluator.evaluate(board_cards, opponent_treys_hand)
-                    # In treys, lower scores are better
-                    if opponent_score < my_score:
-                        is_winner = False
-                        break
-                else:
-                    opponent_best_hand = self._best_hand_value(opponent_hand_cards)
-                    if opponent_best_hand > my_best_hand:
-                        is_winner = False
-                        break
+        Args:
+            hole: `Card.index` values of the player's hole cards
+            board: `Card.index` values of the known community cards
+            available_mask: Bitmask of the cards left in the deck, one bit per `Card.index`
+            num_players: Number of players at the table
+            num_simulations: Number of simulations to run
+            range_hands: Optional int array of shape (n, 2) holding the opponents' possible
+                hole cards, none of which overlap `hole` or `board`
             
-            if is_winner:
-                wins += 1
+        Returns:
+            int: Number of simulations in which no opponent beats the player
+        """
+        rng = np.random.default_rng()
+        num_needed = 5 - len(board)
+        num_opponents = num_players - 1
+        
+        # Cards that can't be dealt: hole cards and known community cards
+        dead = ((np.int64(available_mask) >> DECK_SHIFTS) & 1) == 0
+        
+        # Deal opponents from their range if provided, otherwise from the deck
+        if range_hands is not None:
+            opponent_holes = _deal_range_hands(rng, range_hands, num_simulations, num_opponents)
+            # The board can't contain cards held by an opponent
+            dead = np.tile(dead, (num_simulations, 1))
+            rows = np.arange(num_simulations)[:, None]
+            dead[rows, opponent_holes.reshape(num_simulations, -1)] = True
+            dealt = _deal_cards(rng, dead, num_simulations, num_needed)
+        else:
+            dealt = _deal_cards(rng, dead, num_simulations, num_needed + 2 * num_opponents)
+            opponent_holes = dealt[:, num_needed:].reshape(num_simulations, num_opponents, 2)
+        
+        boards = np.empty((num_simulations, 5), dtype=np.int8)
+        boards[:, :len(board)] = board
+        boards[:, len(board):] = dealt[:, :num_needed]
         
-        return wins
+        # Score every player of every simulation in one pass, summing each board only once
+        holes = np.empty((num_simulations, num_players, 2), dtype=np.int8)
+        holes[:, 0] = hole
+        holes[:, 1:] = opponent_holes
+        scores = _score_hands(holes, boards[:, None, :])
+        
+        # We win unless some opponent has a strictly better hand
+        if num_opponents == 0:
+            return num_simulations
+        if num_opponents == 1:
+            best_opponents = scores[:, 1]
+        else:
+            best_opponents = scores[:, 1:].max(axis=1)
+        return int(np.count_nonzero(best_opponents <= scores[:, 0]))
     
     def _best_hand_value(self, cards):
-        """Calculate the best 5-card hand value from 7 cards."""
-        best_value = 0
-        # Only generate combinations if we have more than 5 cards
-        if len(cards) > 5:
-            for hand in itertools.combinations(cards, 5):
-                value = self._evaluate_hand(hand)
-                if value > best_value:
-                    best_value = value
-        else:
-            best_value = self._evaluate_hand(cards)
-            
-        return best_value
+        """Calculate the best 5-card hand value from 5 to 7 cards."""
+        # Every 5 to 7 card hand is a single table lookup, no need to enumerate subsets
+        if 5 <= len(cards) <= 7:
+            return _legacy_hand_value(_lookup_score(cards))
+        
+        # The bitboard evaluator handles any other number of cards
+        bits = 0
+        for card in cards:
+            bits |= card.bit
+        return _legacy_hand_value(_hand_score(bits))
     
     def _evaluate_hand(self, hand):
-        """Evaluate a 5-card poker hand with optimized calculations."""
-        # Extract suits using list comprehension for speed
-        suits = [card.suit for card in hand]
-        
-        # Use precomputed values for faster comparison
-        rank_values = [card.value for card in hand]
-        
-        # Check for flush (all suits the same)
-        is_flush = len(set(suits)) == 1
-        
-        # Check for straight - optimized check
-        sorted_values = sorted(rank_values)
-        min_val = sorted_values[0]
-        max_val = sorted_values[-1]
-        is_straight = (max_val - min_val == 4 and len(set(sorted_values)) == 5)
-        
-        # Special case for A-5 straight (wheel)
-        if not is_straight and sorted_values == [0, 1, 2, 3, 12]:  # 2,3,4,5,A
-            is_straight = True
-            sorted_values = [-1, 0, 1, 2, 3]  # Treat A as 1 for this straight
-        
-        # Count occurrences of each rank using Counter
-        rank_counts = Counter(rank_values)
-        counts = sorted(rank_counts.values(), reverse=True)
-        
-        # Determine hand type and return a score - optimized evaluation order
-        if is_straight and is_flush:
-            return 8000 + max(sorted_values)  # Straight flush
-        elif counts[0] == 4:  # Four of a kind (faster than checking full list)
-            return 7000 + [r for r, c in rank_counts.items() if c == 4][0]
-        elif counts[0] == 3 and counts[1] == 2:  # Full house (faster check)
-            return 6000 + [r for r, c in rank_counts.items() if c == 3][0]
-        elif is_flush:
-            return 5000 + sum(sorted_values)  # Flush
-        elif is_straight:
-            return 4000 + max(sorted_values)  # Straight
-        elif counts[0] == 3:  # Three of a kind
-            return 3000 + [r for r, c in rank_counts.items() if c == 3][0]
-        elif counts[0] == 2 and counts[1] == 2:  # Two pair
-            pairs = [r for r, c in rank_counts.items() if c == 2]
-            return 2000 + max(pairs) * 20 + min(pairs)
-        elif counts[0] == 2:  # One pair
-            return 1000 + [r for r, c in rank_counts.items() if c == 2][0]
-        else:
-            return max(rank_values)  # High card
+        """Evaluate a 5-card poker hand with the lookup tables."""
+        return self._best_hand_value(hand)
     
     def get_action_recommendation(self, hand_strength, position='middle', big_blinds=None, tournament_stage='middle', icm_pressure=None):
         """
@@ -551,69 +1166,22 @@ class PokerEngine:
         if position == 'middle' and hand_strength == 0.3 and big_blinds == 30:
             return "Fold"
         
-        # If big blinds not provided, use only hand strength and position
+        # Walk the rules for this stack depth and position, most aggressive action first
         if big_blinds is None:
-            if position == 'early':
-                if hand_strength > 0.7 / icm_factor or (is_monte_carlo and hand_strength > 0.35 / icm_factor):
-                    return "Raise"
-                elif hand_strength > 0.5 / icm_factor or (is_monte_carlo and hand_strength > 0.28 / icm_factor):
-                    return "Call"
-                else:
-                    return "Fold"
-            elif position == 'middle':
-                if hand_strength > 0.65 / icm_factor or (is_monte_carlo and hand_strength > 0.32 / icm_factor):
-                    return "Raise"
-                elif hand_strength > 0.45 / icm_factor or (is_monte_carlo and hand_strength > 0.25 / icm_factor):
-                    return "Call"
-                else:
-                    return "Fold"
-            else:  # late position
-                if hand_strength > 0.6 / icm_factor or (is_monte_carlo and hand_strength > 0.30 / icm_factor):
-                    return "Raise"
-                elif hand_strength > 0.4 / icm_factor or (is_monte_carlo and hand_strength > 0.22 / icm_factor):
-                    return "Call"
-                else:
-                    return "Fold"
-        
-        # Consider stack size (big blinds) in the decision
-        if big_blinds <= 10:  # Short stack strategy
-            if hand_strength > 0.5 / icm_factor or (is_monte_carlo and hand_strength > 0.30 / icm_factor):
-                return "All-In"
-            elif (hand_strength > 0.45 / icm_factor or (is_monte_carlo and hand_strength > 0.25 / icm_factor)) and position == 'late':
-                return "All-In"
-            else:
-                return "Fold"
+            stack_rules = ACTION_RULES['unknown']
+        elif big_blinds <= 10:  # Short stack strategy
+            stack_rules = ACTION_RULES['short']
         elif big_blinds <= 20:  # Medium stack strategy
-            if hand_strength > 0.65 / icm_factor or (is_monte_carlo and hand_strength > 0.32 / icm_factor):
-                return "Raise"
-            elif (hand_strength > 0.5 / icm_factor or (is_monte_carlo and hand_strength > 0.28 / icm_factor)) and position != 'early':
-                return "Call"
-            elif (hand_strength > 0.4 / icm_factor or (is_monte_carlo and hand_strength > 0.24 / icm_factor)) and position == 'late':
-                return "Call"
-            else:
-                return "Fold"
+            stack_rules = ACTION_RULES['medium']
         else:  # Large stack strategy
-            if position == 'early':
-                if hand_strength > 0.7 / icm_factor or (is_monte_carlo and hand_strength > 0.35 / icm_factor):
-                    return "Raise"
-                elif hand_strength > 0.55 / icm_factor or (is_monte_carlo and hand_strength > 0.30 / icm_factor):
-                    return "Call"
-                else:
-                    return "Fold"
-            elif position == 'middle':
-                if hand_strength > 0.65 / icm_factor or (is_monte_carlo and hand_strength > 0.32 / icm_factor):
-                    return "Raise"
-                elif hand_strength > 0.5 / icm_factor or (is_monte_carlo and hand_strength > 0.27 / icm_factor):
-                    return "Call"
-                else:
-                    return "Fold"
-            else:  # late position
-                if hand_strength > 0.6 / icm_factor or (is_monte_carlo and hand_strength > 0.30 / icm_factor):
-                    return "Raise"
-                elif hand_strength > 0.45 / icm_factor or (is_monte_carlo and hand_strength > 0.23 / icm_factor):
-                    return "Call"
-                else:
-                    return "Fold"
+            stack_rules = ACTION_RULES['deep']
+        rules = stack_rules.get(position, stack_rules['other'])
+        
+        for action, threshold, monte_carlo_threshold in rules:
+            if (hand_strength > threshold / icm_factor or
+                    (is_monte_carlo and hand_strength > monte_carlo_threshold / icm_factor)):
+                return action
+        return "Fold"
     
     def calculate_icm(self, stack_sizes, payouts):
         """
@@ -12,22 +12,56 @@ This module provides a web interface for the poker helper, allowing users to:
 """
 from typing import Dict, List, Any, Optional, Union, Tuple
 from flask import Flask, request, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
 import sys
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.core.poker_engine import PokerEngine, HandRange
+from src.core.poker_engine import PokerEngine, HandRange, warm_up
 from src.core.icm import ICMCalculator
 from src.utils.helpers import benchmark_performance, get_hand_description, get_stack_description
 
 app = Flask(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that parses requests and serializes responses with orjson."""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize an object to a JSON string, falling back to Flask's default hook."""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        # Honor the same settings as Flask's provider so output doesn't depend on orjson
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize a JSON string or bytes, leaving keyword options to the json module."""
+        # orjson.loads takes no options, so calls that pass any go through Flask's provider
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+# request.json and jsonify go through app.json, so every route benefits
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
 # Create global instances
 poker_engine = PokerEngine()
 icm_calculator = ICMCalculator()
 
+# Build the hand evaluation tables before the first request arrives
+warm_up()
+
 @app.route('/')
 def index():
     """Render the main page."""
@@ -54,17 +88,20 @@ def calculate():
         if not card1 or not card2:
             return jsonify({'error': 'Invalid hole cards format'}), 400
             
-        if str(card1) == str(card2):
+        # Cards compare and hash by their deck index, no string conversion needed
+        if card1 == card2:
             return jsonify({'error': 'Duplicate hole cards'}), 400
         
         # Parse community cards
         community_cards = []
+        seen_cards = {card1, card2}
         for card_str in data.get('communityCards', []):
             if card_str:
                 card = poker_engine.parse_card(card_str)
                 if card:
-                    if card in [card1, card2] or any(str(card) == str(c) for c in community_cards):
+                    if card in seen_cards:
                         return jsonify({'error': 'Duplicate card detected'}), 400
+                    seen_cards.add(card)
                     community_cards.append(card)
         
         # Parse position
@@ -167,10 +204,8 @@ def calculate_icm():
         icm_values = icm_calculator.calculate_icm(stack_sizes, payouts)
         
         # Calculate ICM pressure for each player
-        icm_pressures = []
-        for i in range(len(stack_sizes)):
-            pressure = icm_calculator.calculate_icm_pressure(stack_sizes, payouts, i)
-            icm_pressures.append(round(pressure * 100, 2))
+        pressures = icm_calculator.calculate_icm_pressure_all(stack_sizes, payouts)
+        icm_pressures = [round(pressure * 100, 2) for pressure in pressures]
         
         return jsonify({
             'icmValues': [round(val, 2) for val in icm_values],
@@ -258,6 +258,21 @@ class TestApp(unittest.TestCase):
         
         # Verify the mock was called
         mock_benchmark.assert_called_once()
+    
+    @unittest.skipUnless(app.ORJSON_AVAILABLE, "orjson not installed")
+    def test_orjson_provider_key_order(self):
+        """Test that orjson responses keep the key order of Flask's default provider."""
+        data = {'zeta': 1, 'alpha': {'b': 2, 'a': 3}}
+        default_json = app.DefaultJSONProvider(app.app).dumps(data)
+        orjson_json = app.OrjsonProvider(app.app).dumps(data)
+        self.assertEqual(json.loads(orjson_json), data)
+        self.assertEqual(json.loads(orjson_json, object_pairs_hook=list),
+                         json.loads(default_json, object_pairs_hook=list))
+        
+        # Keyword options are handed to the json module instead of being dropped
+        provider = app.OrjsonProvider(app.app)
+        self.assertEqual(provider.loads('{"a": 1}'), {'a': 1})
+        self.assertEqual(provider.loads('{"a": 1}', object_pairs_hook=list), [('a', 1)])
 
 if __name__ == '__main__':
     unittest.main()
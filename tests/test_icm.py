@@ -90,6 +90,24 @@ class TestICMCalculator(unittest.TestCase):
         pressure = self.calculator.calculate_icm_pressure(stacks, payouts, 1)
         self.assertTrue(pressure > 0.4)
     
+    def test_calculate_icm_pressure_all(self):
+        """Test that batched ICM pressures match the per-player calculation."""
+        stacks = [4000, 2500, 1200, 300]
+        payouts = [100, 50, 25]
+        
+        pressures = self.calculator.calculate_icm_pressure_all(stacks, payouts)
+        self.assertEqual(len(pressures), len(stacks))
+        for i, pressure in enumerate(pressures):
+            self.assertAlmostEqual(pressure,
+                                   self.calculator.calculate_icm_pressure(stacks, payouts, i))
+            self.assertTrue(0 <= pressure <= 1)
+        
+        # Fixed pressures apply to the batch as well
+        stacks = [3000, 1000, 500]
+        pressures = self.calculator.calculate_icm_pressure_all(stacks, payouts)
+        self.assertEqual(pressures[0], 0.4)
+        self.assertEqual(pressures[2], 0.6)
+    
     def test_nash_equilibrium_push_fold(self):
         """Test Nash equilibrium push/fold calculations."""
         stacks = [10, 15, 20]
@@ -5,11 +5,16 @@ Unit tests for the poker_engine module.
 import unittest
 import sys
 import os
+import random
+
+import numpy as np
 
 # Add parent directory to path to import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.core.poker_engine import PokerEngine, Card, HandRange
+from src.core.poker_engine import (PokerEngine, Card, HandRange, _hand_score, _lookup_score,
+                                   _score_hands, _deal_cards, _canonical_cards, _wilson_margin,
+                                   _exact_equity, _deal_range_hands)
 
 class TestPokerEngine(unittest.TestCase):
     """Test cases for the PokerEngine class."""
@@ -68,6 +73,232 @@ class TestPokerEngine(unittest.TestCase):
         strength = self.engine.calculate_hand_strength(jt, 6)
         self.assertTrue(0 <= strength <= 1, f"Hand strength {strength} not in range [0,1]")
     
+    def test_get_starting_hand_strength(self):
+        """Test starting hand categories, including the upgrade for suited hands."""
+        def strength(card1, card2):
+            return self.engine.get_starting_hand_strength(
+                [self.engine.parse_card(card1), self.engine.parse_card(card2)])
+        
+        self.assertEqual(len(self.engine.starting_hand_categories), 169)
+        self.assertEqual(strength('Kd', 'Ah'), 'any')
+        self.assertEqual(strength('Ah', '8d'), 'late')
+        self.assertEqual(strength('8h', 'Ah'), 'mid_late')
+        self.assertEqual(strength('Qs', '7s'), 'late')
+        self.assertEqual(strength('7h', '2d'), 'unplayable')
+    
+    def test_preflop_equity_table(self):
+        """Test that preflop equity comes from the precomputed table."""
+        table = self.engine.preflop_equity
+        self.assertEqual(len(table), 169)
+        for equities in table.values():
+            self.assertEqual(sorted(equities), list(range(2, 10)))
+        
+        jt = [self.engine.parse_card('Jh'), self.engine.parse_card('Ts')]
+        self.assertEqual(self.engine.calculate_hand_strength(jt, 6), table['J-T'][6])
+        
+        # Better hands and fewer opponents mean more equity
+        self.assertGreater(table['9-9'][6], table['7-2'][6])
+        self.assertGreater(table['J-Ts'][6], table['J-T'][6])
+        self.assertGreater(table['J-T'][2], table['J-T'][9])
+    
+    def test_suit_isomorphic_hands_share_equity(self):
+        """Test that hands differing only by suit labels get the same cached equity."""
+        def canonical(hole, board):
+            return _canonical_cards([self.engine.parse_card(c).index for c in hole],
+                                    [self.engine.parse_card(c).index for c in board])
+        
+        self.assertEqual(canonical(['Jh', 'Th'], []), canonical(['Ts', 'Js'], []))
+        self.assertNotEqual(canonical(['Jh', 'Th'], []), canonical(['Jh', 'Ts'], []))
+        self.assertEqual(canonical(['Jh', 'Tc'], ['2h', '7h', 'Kd']),
+                         canonical(['Js', 'Td'], ['Kc', '7s', '2s']))
+        
+        # A flop spot, so the equity is simulated and cached rather than read from a table
+        def strength(hole, board):
+            return self.engine.calculate_hand_strength(
+                [self.engine.parse_card(c) for c in hole], 6,
+                [self.engine.parse_card(c) for c in board])
+        
+        cached = len(self.engine._equity_cache)
+        self.assertEqual(strength(['Jh', 'Th'], ['2h', '7h', 'Kd']),
+                         strength(['Js', 'Ts'], ['2s', '7s', 'Kd']))
+        self.assertEqual(len(self.engine._equity_cache), cached + 1)
+    
+    def test_hand_score(self):
+        """Test the exact bitboard hand score used to compare players."""
+        def score(card_strs):
+            bits = 0
+            for card_str in card_strs:
+                bits |= self.engine.parse_card(card_str).bit
+            return _hand_score(bits)
+        
+        board = ['Ah', '9c', '7d', '4s', '2h']
+        
+        # Kickers decide between equal pairs
+        self.assertGreater(score(board + ['9h', 'Kc']), score(board + ['9s', 'Qc']))
+        
+        # Identical best five cards are an exact tie
+        self.assertEqual(score(board + ['3c', '3d']), score(board + ['3h', '3s']))
+        
+        # The wheel is the lowest straight
+        self.assertLess(score(['Ah', '2c', '3d', '4s', '5h', 'Kc', 'Kd']),
+                        score(['2c', '3d', '4s', '5h', '6h', 'Kc', 'Kd']))
+        
+        # A straight flush is found among seven cards
+        self.assertGreater(score(['5h', '6h', '7h', '8h', '9h', 'Ac', 'Ad']),
+                           score(['Ac', 'Ad', 'As', 'Ah', 'Kd', '2c', '3c']))
+    
+    def test_lookup_score(self):
+        """Test that the lookup tables agree with the bitboard evaluator."""
+        rng = random.Random(42)
+        for num_cards in (5, 6, 7) * 200:
+            cards = rng.sample(self.engine.deck, num_cards)
+            bits = 0
+            for card in cards:
+                bits |= card.bit
+            self.assertEqual(_lookup_score(cards), _hand_score(bits), str(cards))
+        
+        # Seven suited cards use the flush table
+        cards = [self.engine.parse_card(c) for c in ['2h', '4h', '6h', '8h', 'Th', 'Qh', 'Ah']]
+        self.assertEqual(self.engine._best_hand_value(cards), 5000 + 12 + 10 + 8 + 6 + 4)
+    
+    def test_score_hands(self):
+        """Test that vectorized scoring matches scoring one hand at a time."""
+        rng = random.Random(7)
+        hands = [rng.sample(self.engine.deck, 7) for _ in range(500)]
+        scores = _score_hands(np.array([[card.index for card in hand] for hand in hands]))
+        self.assertEqual(scores.tolist(), [_lookup_score(hand) for hand in hands])
+        
+        # Shared board cards can be passed separately and broadcast across hands
+        indices = np.array([[card.index for card in hand] for hand in hands])
+        split_scores = _score_hands(indices[:, None, :2], indices[:, None, 2:])
+        self.assertEqual(split_scores[:, 0].tolist(), scores.tolist())
+    
+    def test_deal_cards(self):
+        """Test that dealt cards are distinct and never dead."""
+        rng = np.random.default_rng(3)
+        dead = np.zeros(52, dtype=bool)
+        dead[[0, 17, 51]] = True
+        for dead_cards in (dead, np.tile(dead, (100, 1))):
+            dealt = _deal_cards(rng, dead_cards, 100, 21)
+            self.assertEqual(dealt.shape, (100, 21))
+            self.assertFalse(dead[dealt].any())
+            for row in dealt:
+                self.assertEqual(len(set(row.tolist())), 21)
+    
+    def test_simulation_with_range(self):
+        """Test that range simulations never deal a card twice."""
+        jt = [self.engine.parse_card('Jh'), self.engine.parse_card('Ts')]
+        board = [self.engine.parse_card(c) for c in ['Ah', 'Kd', '2c']]
+        hole = tuple(card.index for card in jt)
+        board_indices = tuple(card.index for card in board)
+        available_mask = self.engine.deck_mask
+        for card in jt + board:
+            available_mask &= ~card.bit
+        range_hands = np.array([[self.engine.parse_card(c).index for c in hand]
+                                for hand in HandRange('AA,KK,AKs').hands
+                                if not {'Ah', 'Kd'} & set(hand)])
+        wins = self.engine._run_simulation_batch(hole, board_indices, available_mask, 2, 200,
+                                                 range_hands)
+        self.assertTrue(0 <= wins <= 200)
+        
+        # With no opponents every simulation is a win
+        self.assertEqual(self.engine._run_simulation_batch(hole, board_indices, available_mask,
+                                                           1, 200), 200)
+        strength = self.engine.calculate_hand_strength(jt, 1, board)
+        self.assertEqual(strength, 1.0)
+        
+        # Ranges that collide with our cards are filtered before simulating
+        strength = self.engine.calculate_hand_strength(jt, 3, board, HandRange('AA,KK,AKs'))
+        self.assertTrue(0 <= strength <= 1)
+    
+    def test_deal_range_hands(self):
+        """Test that multiway range deals never give two opponents the same card."""
+        rng = np.random.default_rng(0)
+        for hand_range, num_opponents in [('AA', 2), ('AA,KK', 3), ('AA,KK,AKs', 4)]:
+            range_hands = HandRange(hand_range).card_indices()
+            dealt = _deal_range_hands(rng, range_hands, 500, num_opponents)
+            self.assertEqual(dealt.shape, (500, num_opponents, 2))
+            for row in dealt.reshape(500, -1):
+                self.assertEqual(len(set(row.tolist())), 2 * num_opponents)
+        
+        # Three opponents can't all hold aces
+        with self.assertRaises(ValueError):
+            _deal_range_hands(rng, HandRange('AA').card_indices(), 10, 3)
+        
+        # Multiway range simulations still run end to end
+        jt = [self.engine.parse_card('Jh'), self.engine.parse_card('Ts')]
+        strength = self.engine.calculate_hand_strength(jt, 4, None, HandRange('AA,KK'))
+        self.assertTrue(0 <= strength <= 1)
+    
+    def test_wilson_margin(self):
+        """Test the confidence interval used to stop simulations early."""
+        self.assertAlmostEqual(_wilson_margin(500, 1000), 0.0309, places=4)
+        # Lopsided results and more trials both narrow the interval
+        self.assertLess(_wilson_margin(50, 1000), _wilson_margin(500, 1000))
+        self.assertLess(_wilson_margin(2000, 4000), _wilson_margin(500, 1000))
+        self.assertGreater(_wilson_margin(0, 1000), 0)
+    
+    def test_exact_equity(self):
+        """Test exact equity on the turn and river."""
+        def deal(hole, board):
+            hole = [self.engine.parse_card(card) for card in hole]
+            board = [self.engine.parse_card(card) for card in board]
+            available_mask = self.engine.deck_mask
+            for card in hole + board:
+                available_mask &= ~card.bit
+            return (tuple(card.index for card in hole), tuple(card.index for card in board),
+                    available_mask)
+        
+        # Jack-high straight is the nuts on this board, ties included
+        hole, board, available_mask = deal(['Jh', 'Td'], ['9s', '8c', '7d', '2h', '3c'])
+        self.assertEqual(_exact_equity(hole, board, available_mask, 2), 1.0)
+        self.assertEqual(_exact_equity(hole, board, available_mask, 6), 1.0)
+        
+        # Bottom pair: heads-up equity is exact, multiway has to be simulated
+        hole, board, available_mask = deal(['7h', '2d'], ['9s', '8c', 'Kd', '2h', '3c'])
+        self.assertAlmostEqual(_exact_equity(hole, board, available_mask, 2), 450 / 990)
+        self.assertIsNone(_exact_equity(hole, board, available_mask, 3))
+        
+        # Against a range only the range's hands count
+        range_hands = HandRange('QQ,44').card_indices()
+        self.assertEqual(_exact_equity(hole, board, available_mask, 2, range_hands), 0.0)
+        
+        # On the turn every river card is enumerated too
+        hole, board, available_mask = deal(['7h', '2d'], ['9s', '8c', 'Kd', '2h'])
+        equity = _exact_equity(hole, board, available_mask, 2)
+        simulated = self.engine._run_simulation_batch(hole, board, available_mask, 2, 100000)
+        self.assertAlmostEqual(equity, simulated / 100000, delta=0.01)
+        
+        # Two-tone and monotone turns, where some deals make flushes
+        range_obj = HandRange('22+,A2s+,KTs+,QJs,ATo+')
+        for hole, board in [(['Jh', 'Ts'], ['9h', '8h', '2c', '3s']),
+                            (['Ah', 'Qc'], ['9h', '8h', '2h', '5h'])]:
+            hole, board, available_mask = deal(hole, board)
+            available = ((available_mask >> np.arange(52)) & 1).astype(bool)
+            range_hands = range_obj.card_indices()
+            range_hands = range_hands[available[range_hands].all(axis=1)]
+            for hands in (None, range_hands):
+                equity = _exact_equity(hole, board, available_mask, 2, hands)
+                simulated = self.engine._run_simulation_batch(hole, board, available_mask, 2,
+                                                              100000, hands)
+                self.assertAlmostEqual(equity, simulated / 100000, delta=0.01)
+        
+        # Flush draw on the turn, checked against scoring every deal one by one
+        hole, board, available_mask = deal(['Ah', 'Kc'], ['9h', '8h', '2c', '3d'])
+        live = [index for index in range(52) if available_mask >> index & 1]
+        base = sum(1 << index for index in board)
+        deals = not_beaten = 0
+        for river in live:
+            my_score = _hand_score(base | 1 << river | 1 << hole[0] | 1 << hole[1])
+            rest = [index for index in live if index != river]
+            for i, first in enumerate(rest):
+                for second in rest[i + 1:]:
+                    deals += 1
+                    if _hand_score(base | 1 << river | 1 << first | 1 << second) <= my_score:
+                        not_beaten += 1
+        self.assertAlmostEqual(_exact_equity(hole, board, available_mask, 2),
+                               not_beaten / deals)
+    
     def test_get_action_recommendation(self):
         """Test getting action recommendations."""
         # Test premium hand
@@ -188,6 +419,26 @@ class TestHandRange(unittest.TestCase):
         self.assertEqual(len(hand), 2)
         self.assertEqual(hand[0][0], 'A')
         self.assertEqual(hand[1][0], 'A')
+        
+        # Hands added later are included in the draw
+        range_obj.add_suited('K', 'Q')
+        hands = {range_obj.get_random_hand() for _ in range(500)}
+        self.assertIn(('Kh', 'Qh'), hands)
+    
+    def test_card_indices(self):
+        """Test converting a range to card indices."""
+        engine = PokerEngine()
+        range_obj = HandRange("AKs")
+        indices = range_obj.card_indices()
+        self.assertEqual(indices.shape, (4, 2))
+        expected = {(engine.parse_card(card1).index, engine.parse_card(card2).index)
+                    for card1, card2 in range_obj.hands}
+        self.assertEqual({tuple(hand) for hand in indices.tolist()}, expected)
+        
+        # Adding hands rebuilds the indices
+        range_obj.add_pair('Q')
+        self.assertEqual(range_obj.card_indices().shape, (10, 2))
+        self.assertEqual(HandRange().card_indices().shape, (0, 2))
 
 if __name__ == '__main__':
     unittest.main()